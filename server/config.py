@@ -2,7 +2,7 @@
 Configuration management for FraudGuard backend.
 Handles environment variables and application settings.
 """
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
@@ -23,12 +23,19 @@ class Settings(BaseSettings):
     suspicious_threshold: int = 70
     dangerous_threshold: int = 100
     
+    # Number of URL analyses kept in the in-memory LRU cache
+    analysis_cache_size: int = 4096
+    
+    # Maximum number of URLs accepted by the batch analysis endpoint
+    max_batch_size: int = 100
+    
     # CORS configuration
     cors_origins: list[str] = ["chrome-extension://*"]
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False
+    )
 
 
 # Global settings instance
@@ -2,52 +2,159 @@
 Core fraud detection engine.
 Implements various fraud detection algorithms and signal analysis.
 """
-from typing import List
-from urllib.parse import urlparse
-import difflib
+from functools import lru_cache
+from itertools import islice
+from typing import Any, ClassVar, List, Sequence
 import re
+import threading
 from datetime import datetime, timedelta
 
+try:
+    # Compiled build of difflib's SequenceMatcher: same algorithm, same ratios
+    from cydifflib import SequenceMatcher  # type: ignore[import-untyped]
+except ImportError:
+    from difflib import SequenceMatcher
+
+try:
+    # Multi-pattern keyword matcher; falls back to substring checks when not installed
+    import ahocorasick  # type: ignore[import-not-found]
+except ImportError:
+    ahocorasick = None
+
 from .models import FraudSignal, RiskLevel
 
 
+# Known legitimate bank and payment domains
+LEGITIMATE_DOMAINS = (
+    "chase.com",
+    "bankofamerica.com",
+    "wellsfargo.com",
+    "citibank.com",
+    "usbank.com",
+    "pnc.com",
+    "capitalone.com",
+    "tdbank.com",
+    "paypal.com",
+    "stripe.com",
+    "square.com",
+    "venmo.com",
+    "zelle.com",
+)
+
+# Set view of LEGITIMATE_DOMAINS for O(1) exact-match lookups
+LEGITIMATE_DOMAIN_SET = frozenset(LEGITIMATE_DOMAINS)
+
+# Similarities at or below this ratio never contribute to the risk score
+SIMILARITY_FLOOR = 0.5
+
+# Sum of the risk score weights, accumulated in signal order. In floating point
+# this is 0.9999999999999999, not 1.0, and scores at the 30/70 risk-level
+# boundaries depend on dividing by exactly this value.
+_TOTAL_WEIGHT = 0.0 + 0.4 + 0.3 + 0.2 + 0.1
+
+# SequenceMatcher indexes seq2 once, so each legitimate domain is kept as seq2 of
+# its own matcher. Matchers are stateful, hence one set per thread.
+_matcher_state = threading.local()
+
+
+def legitimate_matchers() -> tuple[SequenceMatcher, ...]:
+    """
+    This thread's SequenceMatchers, one per LEGITIMATE_DOMAINS entry, in order.
+    """
+    matchers = getattr(_matcher_state, "matchers", None)
+    if matchers is None:
+        matchers = tuple(SequenceMatcher(None, "", legit) for legit in LEGITIMATE_DOMAINS)
+        _matcher_state.matchers = matchers
+    return matchers
+
+
+# Longest URL kept in the analysis cache; longer URLs are analyzed uncached
+MAX_URL_LENGTH = 2048
+
+# Like urlparse (and browsers), ignore leading C0 controls and spaces and drop
+# every tab, CR and LF before locating the netloc
+URL_LEADING_IGNORED = "".join(chr(code) for code in range(0x21))
+URL_REMOVED_CHARS = str.maketrans("", "", "\t\r\n")
+
+# Domain of a lowercased URL: the netloc (everything between "//" and the first
+# "/", "?" or "#") with a single leading "www." left outside the group
+DOMAIN_PATTERN = re.compile(r"(?:[a-z][a-z0-9+.-]*:)?//(?:www\.)?([^/?#]*)")
+
+# Phishing keywords commonly used in fraudulent sites
+PHISHING_KEYWORDS = (
+    "secure-login",
+    "verify-account",
+    "update-info",
+    "suspended-account",
+    "urgent-action",
+    "confirm-identity",
+    "security-alert",
+    "account-locked",
+    "verify-now",
+    "immediate-action",
+)
+
+
+def build_keyword_automaton() -> Any:
+    """
+    Build an Aho-Corasick automaton over PHISHING_KEYWORDS.
+    
+    Values are keyword indexes. Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for index, keyword in enumerate(PHISHING_KEYWORDS):
+        automaton.add_word(keyword, index)
+    automaton.make_automaton()
+    return automaton
+
+
+# Keyword matchers: static, so built once at import and shared by every detector
+
+# Precompiled alternation; the lookahead keeps overlapping keywords
+KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword in PHISHING_KEYWORDS) + "))"
+)
+
+# Preferred when installed: single automaton, matched in one pass per URL
+KEYWORD_AUTOMATON = build_keyword_automaton()
+
+
 class FraudDetector:
     """Main fraud detection engine."""
     
-    # Known legitimate bank and payment domains
-    LEGITIMATE_DOMAINS = [
-        "chase.com",
-        "bankofamerica.com",
-        "wellsfargo.com",
-        "citibank.com",
-        "usbank.com",
-        "pnc.com",
-        "capitalone.com",
-        "tdbank.com",
-        "paypal.com",
-        "stripe.com",
-        "square.com",
-        "venmo.com",
-        "zelle.com",
-    ]
+    # Kept as class attributes for existing callers
+    LEGITIMATE_DOMAINS: ClassVar[tuple[str, ...]] = LEGITIMATE_DOMAINS
+    PHISHING_KEYWORDS: ClassVar[tuple[str, ...]] = PHISHING_KEYWORDS
     
-    # Phishing keywords commonly used in fraudulent sites
-    PHISHING_KEYWORDS = [
-        "secure-login",
-        "verify-account",
-        "update-info",
-        "suspended-account",
-        "urgent-action",
-        "confirm-identity",
-        "security-alert",
-        "account-locked",
-        "verify-now",
-        "immediate-action",
-    ]
-    
-    def __init__(self):
-        """Initialize the fraud detector."""
-        pass
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize the fraud detector.
+        
+        Args:
+            cache_size: Maximum number of URL analyses kept in the LRU cache
+        """
+        # Analyses depend only on the URL string, so whole results are memoised
+        self._analyze_cached = lru_cache(maxsize=cache_size)(self._analyze)
+        
+        # Constant signals are built once; FraudSignal is frozen, so sharing is safe
+        self._domain_age_signal = FraudSignal(
+            name="Domain Age",
+            score=0.0,  # Placeholder - will be implemented with actual API
+            description="Domain age check (not yet implemented)"
+        )
+        self._https_signal = FraudSignal(
+            name="SSL/HTTPS",
+            score=0.0,
+            description="URL uses HTTPS (certificate validation not yet implemented)"
+        )
+        self._no_https_signal = FraudSignal(
+            name="SSL/HTTPS",
+            score=50.0,
+            description="URL does not use HTTPS - sensitive data transmission is insecure"
+        )
     
     def analyze_url(self, url: str) -> tuple[float, List[FraudSignal], str]:
         """
@@ -59,34 +166,92 @@ class FraudDetector:
         Returns:
             Tuple of (risk_score, signals, explanation)
         """
-        signals: List[FraudSignal] = []
+        if len(url) > MAX_URL_LENGTH:
+            # Still analyzed, but never cached, so clients cannot pin large strings
+            risk_score, signals, explanation = self._analyze(url)
+        else:
+            risk_score, signals, explanation = self._analyze_cached(url)
+        # Fresh list so callers cannot mutate the cached entry
+        return risk_score, list(signals), explanation
+    
+    def analyze_urls(self, urls: List[str]) -> List[tuple[float, List[FraudSignal], str]]:
+        """
+        Analyze a batch of URLs for fraud risk.
         
-        # Extract domain from URL
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
+        Args:
+            urls: The URLs to analyze
+            
+        Returns:
+            List of (risk_score, signals, explanation) tuples, in input order
+        """
+        return [self.analyze_url(url) for url in urls]
+    
+    def _analyze(self, url: str) -> tuple[float, tuple[FraudSignal, ...], str]:
+        """
+        Run every check on a URL; memoised by analyze_url.
+        """
+        # Lowercase once; shared by domain extraction and keyword matching
+        url_lower = url.lower()
+        domain = self._extract_domain(url_lower)
         
-        # Remove www. prefix for comparison
-        if domain.startswith("www."):
-            domain = domain[4:]
+        # Known legitimate domains are trusted outright; skip the remaining checks
+        if domain in LEGITIMATE_DOMAIN_SET:
+            return self._legitimate_result(domain)
         
         # 1. URL Similarity Analysis
         similarity_signal = self._check_url_similarity(domain, url)
-        signals.append(similarity_signal)
         
+        return self._score(domain, url, url_lower, similarity_signal)
+    
+    def _extract_domain(self, url_lower: str) -> str:
+        """
+        Extract the comparable domain from an already lowercased URL.
+        """
+        url_lower = url_lower.lstrip(URL_LEADING_IGNORED).translate(URL_REMOVED_CHARS)
+        
+        # Netloc as urlparse would return it, minus any www. prefix, in one match
+        match = DOMAIN_PATTERN.match(url_lower)
+        return match.group(1) if match else ""
+    
+    def _legitimate_result(self, domain: str) -> tuple[float, tuple[FraudSignal, ...], str]:
+        """
+        Zero-risk result for a domain in LEGITIMATE_DOMAINS.
+        """
+        signal = FraudSignal(
+            name="URL Similarity",
+            score=0.0,
+            description=f"Domain '{domain}' is a known legitimate domain"
+        )
+        return 0.0, (signal,), "This website is a known legitimate bank or payment domain."
+    
+    def _score(
+        self, domain: str, url: str, url_lower: str, similarity_signal: FraudSignal
+    ) -> tuple[float, tuple[FraudSignal, ...], str]:
+        """
+        Run the remaining checks and combine them with the similarity signal.
+        """
         # 2. Domain Age Check (placeholder - will be implemented with actual API)
         age_signal = self._check_domain_age(domain)
-        signals.append(age_signal)
         
         # 3. HTTPS/SSL Validation
         ssl_signal = self._check_ssl(url)
-        signals.append(ssl_signal)
         
         # 4. Keyword Pattern Detection
-        keyword_signal = self._check_keywords(url)
-        signals.append(keyword_signal)
+        keyword_signal = self._check_keywords(url_lower)
+        
+        # Fixed four signals, built in one go rather than appended
+        signals = (similarity_signal, age_signal, ssl_signal, keyword_signal)
         
         # Calculate overall risk score (weighted average)
-        risk_score = self._calculate_risk_score(signals)
+        risk_score = min(
+            100.0,
+            (
+                0.4 * similarity_signal.score
+                + 0.3 * age_signal.score
+                + 0.2 * ssl_signal.score
+                + 0.1 * keyword_signal.score
+            ) / _TOTAL_WEIGHT
+        )
         
         # Generate explanation
         explanation = self._generate_explanation(risk_score, signals)
@@ -103,22 +268,36 @@ class FraudDetector:
         max_similarity = 0.0
         most_similar_domain = ""
         
-        for legit_domain in self.LEGITIMATE_DOMAINS:
-            # Compare domain names
-            similarity = difflib.SequenceMatcher(None, domain, legit_domain).ratio()
+        # Domain as seq1, as in SequenceMatcher(None, domain, legit_domain);
+        # ratio() is not symmetric
+        for matcher, legit_domain in zip(legitimate_matchers(), LEGITIMATE_DOMAINS):
+            matcher.set_seq1(domain)
+            # Skip the full ratio() when its cheap upper bounds cannot beat the best
+            bound = max(max_similarity, SIMILARITY_FLOOR)
+            if matcher.real_quick_ratio() <= bound or matcher.quick_ratio() <= bound:
+                continue
+            similarity = matcher.ratio()
             if similarity > max_similarity:
                 max_similarity = similarity
                 most_similar_domain = legit_domain
         
+        return self._similarity_signal(domain, max_similarity, most_similar_domain)
+    
+    def _similarity_signal(
+        self, domain: str, max_similarity: float, most_similar_domain: str
+    ) -> FraudSignal:
+        """
+        Build the URL Similarity signal from the best match found.
+        """
         # High similarity (>0.7) with different domain is suspicious
         if max_similarity > 0.7 and domain != most_similar_domain:
             score = min(100, max_similarity * 100)
             description = f"Domain '{domain}' shows {max_similarity:.1%} similarity to legitimate domain '{most_similar_domain}'"
-        elif max_similarity > 0.5:
+        elif max_similarity > SIMILARITY_FLOOR:
             score = max_similarity * 50  # Lower score for moderate similarity
             description = f"Domain '{domain}' shows moderate similarity to known bank domains"
         else:
-            score = 0
+            score = 0.0
             description = f"Domain '{domain}' does not match known bank patterns"
         
         return FraudSignal(
@@ -137,11 +316,7 @@ class FraudDetector:
         # Placeholder: In production, this would query a WHOIS service
         # New domains (< 6 months) are more likely to be fraudulent
         
-        return FraudSignal(
-            name="Domain Age",
-            score=0.0,  # Placeholder - will be implemented with actual API
-            description="Domain age check (not yet implemented)"
-        )
+        return self._domain_age_signal
     
     def _check_ssl(self, url: str) -> FraudSignal:
         """
@@ -152,28 +327,23 @@ class FraudDetector:
         """
         if url.startswith("https://"):
             # In production, would validate certificate
-            return FraudSignal(
-                name="SSL/HTTPS",
-                score=0.0,
-                description="URL uses HTTPS (certificate validation not yet implemented)"
-            )
+            return self._https_signal
         else:
-            return FraudSignal(
-                name="SSL/HTTPS",
-                score=50.0,
-                description="URL does not use HTTPS - sensitive data transmission is insecure"
-            )
+            return self._no_https_signal
     
-    def _check_keywords(self, url: str) -> FraudSignal:
+    def _check_keywords(self, url_lower: str) -> FraudSignal:
         """
         Check for phishing keywords in URL.
-        """
-        url_lower = url.lower()
-        found_keywords = []
         
-        for keyword in self.PHISHING_KEYWORDS:
-            if keyword in url_lower:
-                found_keywords.append(keyword)
+        Expects the already lowercased URL.
+        """
+        if KEYWORD_AUTOMATON is not None:
+            # Report keywords in list order regardless of where they occur in the URL
+            found_indexes = {index for _, index in KEYWORD_AUTOMATON.iter(url_lower)}
+            found_keywords = [PHISHING_KEYWORDS[index] for index in sorted(found_indexes)]
+        else:
+            found = set(KEYWORD_PATTERN.findall(url_lower))
+            found_keywords = [keyword for keyword in PHISHING_KEYWORDS if keyword in found]
         
         if found_keywords:
             score = min(100, len(found_keywords) * 20)
@@ -188,33 +358,7 @@ class FraudDetector:
             description=description
         )
     
-    def _calculate_risk_score(self, signals: List[FraudSignal]) -> float:
-        """
-        Calculate overall risk score from individual signals.
-        Uses weighted average with higher weight on critical signals.
-        """
-        if not signals:
-            return 0.0
-        
-        # Weight different signals
-        weights = {
-            "URL Similarity": 0.4,
-            "Domain Age": 0.3,
-            "SSL/HTTPS": 0.2,
-            "Keyword Pattern": 0.1,
-        }
-        
-        weighted_sum = 0.0
-        total_weight = 0.0
-        
-        for signal in signals:
-            weight = weights.get(signal.name, 0.1)
-            weighted_sum += signal.score * weight
-            total_weight += weight
-        
-        return min(100, weighted_sum / total_weight if total_weight > 0 else 0)
-    
-    def _generate_explanation(self, risk_score: float, signals: List[FraudSignal]) -> str:
+    def _generate_explanation(self, risk_score: float, signals: Sequence[FraudSignal]) -> str:
         """
         Generate human-readable explanation of the risk assessment.
         """
@@ -226,10 +370,11 @@ class FraudDetector:
             base_explanation = "This website shows multiple indicators of potential fraud."
         
         # Add details from significant signals
-        significant_signals = [s for s in signals if s.score > 30]
-        if significant_signals:
-            details = " Key concerns: " + "; ".join([s.description for s in significant_signals[:2]])
-            base_explanation += details
+        # Lazily take at most two; stops scanning once both are found
+        significant_descriptions = (s.description for s in signals if s.score > 30)
+        details = "; ".join(islice(significant_descriptions, 2))
+        if details:
+            base_explanation += " Key concerns: " + details
         
         return base_explanation
     
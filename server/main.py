@@ -2,15 +2,28 @@
 FastAPI application entry point for FraudGuard backend.
 Provides REST API endpoints for fraud detection.
 """
+import re
+from typing import List
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from .config import settings
-from .models import AnalyzeRequest, AnalyzeResponse, RiskLevel
+from .models import (
+    AnalyzeRequest,
+    AnalyzeResponse,
+    BatchAnalyzeRequest,
+    BatchAnalyzeResponse,
+    FraudSignal,
+    RiskLevel,
+)
 from .fraud_detector import FraudDetector
 
 # Initialize FastAPI app
+# Keep the default response class: with a response_model set, FastAPI serializes
+# straight to JSON bytes in pydantic-core, which a custom class (e.g.
+# ORJSONResponse) would bypass.
 app = FastAPI(
     title="FraudGuard API",
     description="AI-powered fraud detection service for bank and payment websites",
@@ -27,7 +40,10 @@ app.add_middleware(
 )
 
 # Initialize fraud detector
-fraud_detector = FraudDetector()
+fraud_detector = FraudDetector(cache_size=settings.analysis_cache_size)
+
+# Accepted URL schemes: http:// or https://
+HTTP_SCHEME_PATTERN = re.compile(r"https?://")
 
 
 @app.get("/")
@@ -47,52 +63,104 @@ async def health_check():
 
 
 @app.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_url(request: AnalyzeRequest):
+def analyze_url(request: AnalyzeRequest):
     """
     Analyze a URL for fraud risk.
     
+    Declared without async so FastAPI runs the CPU-bound analysis in its
+    threadpool instead of blocking the event loop.
+    
     Args:
         request: AnalyzeRequest containing the URL to analyze
         
     Returns:
         AnalyzeResponse with risk score, level, signals, and recommendations
     """
+    # Validate URL format
+    if not HTTP_SCHEME_PATTERN.match(request.url):
+        raise HTTPException(
+            status_code=400,
+            detail="URL must start with http:// or https://"
+        )
+    
     try:
-        # Validate URL format
-        if not request.url.startswith(("http://", "https://")):
-            raise HTTPException(
-                status_code=400,
-                detail="URL must start with http:// or https://"
-            )
-        
         # Perform fraud detection analysis
         risk_score, signals, explanation = fraud_detector.analyze_url(request.url)
         
-        # Determine risk level
-        risk_level = fraud_detector.get_risk_level(risk_score)
+        return build_response(request.url, risk_score, signals, explanation)
         
-        # Get recommendation
-        recommendation = fraud_detector.get_recommendation(risk_level)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error analyzing URL: {str(e)}"
+        )
+
+
+@app.post("/analyze_batch", response_model=BatchAnalyzeResponse)
+def analyze_batch(request: BatchAnalyzeRequest):
+    """
+    Analyze a batch of URLs for fraud risk.
+    
+    Runs in the threadpool for the same reason as analyze_url.
+    
+    Args:
+        request: BatchAnalyzeRequest containing the URLs to analyze
         
-        # Build response
-        response = AnalyzeResponse(
-            url=request.url,
-            risk_score=round(risk_score, 2),
-            risk_level=risk_level,
-            signals=signals,
-            explanation=explanation,
-            recommendation=recommendation
+    Returns:
+        BatchAnalyzeResponse with one AnalyzeResponse per URL, in request order
+    """
+    if len(request.urls) > settings.max_batch_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.max_batch_size} URLs can be analyzed per request"
         )
+    
+    # Validate URL format
+    for url in request.urls:
+        if not HTTP_SCHEME_PATTERN.match(url):
+            raise HTTPException(
+                status_code=400,
+                detail=f"URL must start with http:// or https://: {url}"
+            )
+    
+    try:
+        # Perform fraud detection analysis for the whole batch
+        analyses = fraud_detector.analyze_urls(request.urls)
         
-        return response
+        return BatchAnalyzeResponse(results=[
+            build_response(url, risk_score, signals, explanation)
+            for url, (risk_score, signals, explanation) in zip(request.urls, analyses)
+        ])
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Error analyzing URL: {str(e)}"
+            detail=f"Error analyzing URLs: {str(e)}"
         )
 
 
+def build_response(
+    url: str, risk_score: float, signals: List[FraudSignal], explanation: str
+) -> AnalyzeResponse:
+    """
+    Build an AnalyzeResponse from a fraud detector analysis.
+    """
+    # Determine risk level
+    risk_level = fraud_detector.get_risk_level(risk_score)
+    
+    # Get recommendation
+    recommendation = fraud_detector.get_recommendation(risk_level)
+    
+    return AnalyzeResponse(
+        url=url,
+        risk_score=round(risk_score, 2),
+        risk_level=risk_level,
+        signals=signals,
+        explanation=explanation,
+        recommendation=recommendation
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
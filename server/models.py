@@ -1,7 +1,7 @@
 """
 Pydantic models for request and response schemas.
 """
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, ConfigDict, HttpUrl, Field
 from typing import List, Optional
 from enum import Enum
 
@@ -17,12 +17,13 @@ class AnalyzeRequest(BaseModel):
     """Request model for URL analysis endpoint."""
     url: str = Field(..., description="The URL to analyze for fraud risk")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "url": "https://example-bank.com/login"
             }
         }
+    )
 
 
 class FraudSignal(BaseModel):
@@ -30,6 +31,9 @@ class FraudSignal(BaseModel):
     name: str = Field(..., description="Name of the fraud signal")
     score: float = Field(..., ge=0, le=100, description="Signal score (0-100)")
     description: str = Field(..., description="Human-readable description of the signal")
+    
+    # Immutable so the detector can reuse instances across requests
+    model_config = ConfigDict(frozen=True)
 
 
 class AnalyzeResponse(BaseModel):
@@ -41,8 +45,8 @@ class AnalyzeResponse(BaseModel):
     explanation: str = Field(..., description="Human-readable explanation of the risk assessment")
     recommendation: str = Field(..., description="Recommended action for the user")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "url": "https://example-bank.com/login",
                 "risk_score": 75.5,
@@ -58,4 +62,25 @@ class AnalyzeResponse(BaseModel):
                 "recommendation": "Do not enter any personal or financial information. Exit this site immediately."
             }
         }
+    )
+
+
+class BatchAnalyzeRequest(BaseModel):
+    """Request model for batch URL analysis endpoint."""
+    urls: List[str] = Field(..., description="The URLs to analyze for fraud risk")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "urls": [
+                    "https://example-bank.com/login",
+                    "https://paypa1.com/verify-account"
+                ]
+            }
+        }
+    )
+
 
+class BatchAnalyzeResponse(BaseModel):
+    """Response model for batch URL analysis endpoint."""
+    results: List[AnalyzeResponse] = Field(..., description="Analysis results, in request order")